@@ -0,0 +1,163 @@
+"""
+Shared helpers for finding and reading annotation files
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Get the directory where this script is located
+SCRIPT_DIR = Path(__file__).parent
+
+
+# Annotation files may be a single JSON document or line-delimited JSON (one annotation per line)
+JSON_LINES_SUFFIXES = ('.jsonl', '.ndjson')
+
+# main.py journals each annotation next to the annotator's .json file (annotations_<name>.journal.jsonl)
+# until the next full save; file discovery skips journals, and readers merge them into the .json data
+JOURNAL_SUFFIX = '.journal.jsonl'
+
+
+def _loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path):
+    # Parse the raw bytes directly, skipping the text-mode decode pass
+    return _loads(Path(path).read_bytes())
+
+
+def write_json(path, data):
+    """Write data as 2-space indented UTF-8 JSON, atomically replacing any existing file."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    if orjson is not None:
+        tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def append_json_line(f, record):
+    """Append one record to a line-delimited JSON file opened in binary mode."""
+    if orjson is not None:
+        f.write(orjson.dumps(record) + b'\n')
+    else:
+        f.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n')
+
+
+def read_json_at(f, start, end):
+    """Parse the JSON value stored at bytes [start, end) of a file opened in binary mode."""
+    f.seek(start)
+    return _loads(f.read(end - start))
+
+
+def _read_json_lines(path):
+    with open(path, 'rb') as f:
+        lines = [line for line in f if line.strip()]
+    
+    annotations = [_loads(line) for line in lines[:-1]]
+    if lines:
+        # A crash in the middle of an append leaves a partial last line; drop it instead of failing
+        try:
+            annotations.append(_loads(lines[-1]))
+        except ValueError:
+            print(f"WARNING: Ignoring incomplete last line in {Path(path).name}")
+    return annotations
+
+
+def journal_path(path):
+    """Return the journal file for an annotation file (annotations_<name>.json -> annotations_<name>.journal.jsonl)."""
+    path = Path(path)
+    return path.with_name(path.stem + JOURNAL_SUFFIX)
+
+
+def read_journal(path):
+    """Return the annotations journaled for an annotation file, or None if it has no journal."""
+    journal = journal_path(path)
+    if not journal.exists():
+        return None
+    return _read_json_lines(journal)
+
+
+def read_annotation_file(path):
+    """Load an annotator's file as {'annotator': ..., 'annotations': [...]}.
+
+    Annotations still only in the file's journal (made since the last full save) are included.
+    """
+    path = Path(path)
+    if path.suffix not in JSON_LINES_SUFFIXES:
+        data = read_json(path)
+    else:
+        # Line-delimited files carry no header, so the annotator comes from the file name
+        annotator = path.stem[len('annotations_'):] if path.stem.startswith('annotations_') else path.stem
+        data = {'annotator': annotator, 'annotations': _read_json_lines(path)}
+    
+    # The journal starts as a copy of the saved annotations, so it is only newer if it is longer
+    journaled = read_journal(path)
+    if journaled is not None and len(journaled) > len(data['annotations']):
+        data['annotations'] = journaled
+    return data
+
+
+def read_annotation_files(paths):
+    """Read several annotation files concurrently, returning their data in the same order."""
+    paths = list(paths)
+    if not paths:
+        return []
+    # File reads release the GIL, so a small pool overlaps one file's I/O with another's parsing
+    with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+        return list(executor.map(read_annotation_file, paths))
+
+
+def iter_document_ids(path):
+    """Yield the document ids in an annotation file (and its journal) without building the annotation dicts.
+
+    Ids may repeat; callers collect them into a set.
+    """
+    path = Path(path)
+    if ijson is None or path.suffix in JSON_LINES_SUFFIXES:
+        for ann in read_annotation_file(path)['annotations']:
+            yield ann['document_id']
+        return
+    
+    with open(path, 'rb') as f:
+        yield from ijson.items(f, 'annotations.item.document_id')
+    for ann in read_journal(path) or ():
+        yield ann['document_id']
+
+
+def annotation_files():
+    """Return the primary annotations_<name> files (no backups or re-annotations).
+
+    If an annotator has both a .json and a line-delimited file, the .json file is used.
+    """
+    files = {}
+    # One directory pass, filtering on the entry names
+    with os.scandir(SCRIPT_DIR) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.startswith('annotations_') or 'backup' in name or 'reannotat' in name:
+                continue
+            if name.endswith(JOURNAL_SUFFIX):
+                continue
+            stem, dot, suffix = name.rpartition('.')
+            if not dot or (suffix != 'json' and '.' + suffix not in JSON_LINES_SUFFIXES):
+                continue
+            if stem not in files or suffix == 'json':
+                files[stem] = Path(entry.path)
+    return list(files.values())
@@ -5,67 +5,81 @@ This script calculates Cohen's Kappa, Fleiss' Kappa, or Krippendorff's Alpha
 depending on the annotation setup.
 """
 
-import json
-from collections import defaultdict
+import bisect
+from collections import Counter, defaultdict
 from pathlib import Path
 import krippendorff
 import numpy as np
+from annotation_io import annotation_files, read_annotation_file, read_annotation_files
 
 # Get the directory where this script is located
 SCRIPT_DIR = Path(__file__).parent
 
+# Agreement interpretation (Landis & Koch, 1977): a score below AGREEMENT_THRESHOLDS[i]
+# falls into AGREEMENT_LEVELS[i]; scores of 0.80 and above are almost perfect
+AGREEMENT_THRESHOLDS = (0.0, 0.20, 0.40, 0.60, 0.80)
+AGREEMENT_LEVELS = (
+    "Poor (less than chance agreement)",
+    "Slight agreement",
+    "Fair agreement",
+    "Moderate agreement",
+    "Substantial agreement",
+    "Almost perfect agreement"
+)
+AGREEMENT_GUIDELINES = """
+General guidelines (Landis & Koch, 1977):
+  < 0.00: Poor
+  0.00-0.20: Slight
+  0.21-0.40: Fair
+  0.41-0.60: Moderate
+  0.61-0.80: Substantial
+  0.81-1.00: Almost Perfect"""
+
 
 def load_all_annotations():
-    annotation_files = list(SCRIPT_DIR.glob('annotations_*.json'))
-    annotation_files = [f for f in annotation_files if 'backup' not in f.name and 'reannotate_' not in f.name]
+    files = annotation_files()
     
-    if len(annotation_files) == 0:
+    if len(files) == 0:
         print("ERROR: No annotation files found")
         return None
     
-    print(f"Found {len(annotation_files)} annotation file(s):")
-    for f in annotation_files:
+    print(f"Found {len(files)} annotation file(s):")
+    for f in files:
         print(f"  - {f.name}")
     
     all_data = {}
-    for file in annotation_files:
-        with open(file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            annotator = data['annotator']
-            
-            # Combine regular annotations and re-annotations
-            annotations = data['annotations']
-            
-            # Check for re-annotation file
-            reannotation_file = SCRIPT_DIR / f"{annotator}_reannotation.json"
-            if reannotation_file.exists():
-                with open(reannotation_file, 'r', encoding='utf-8') as rf:
-                    reann_data = json.load(rf)
-                    annotations.extend(reann_data['annotations'])
-                    print(f"    + {len(reann_data['annotations'])} re-annotations")
-            
-            all_data[annotator] = annotations
+    for data in read_annotation_files(files):
+        annotator = data['annotator']
+        
+        # Combine regular annotations and re-annotations
+        annotations = data['annotations']
+        
+        # Check for re-annotation file
+        reannotation_file = SCRIPT_DIR / f"{annotator}_reannotation.json"
+        if reannotation_file.exists():
+            reann_data = read_annotation_file(reannotation_file)
+            annotations.extend(reann_data['annotations'])
+            print(f"    + {len(reann_data['annotations'])} re-annotations")
+        
+        all_data[annotator] = annotations
     
     return all_data
 
 
 def find_overlapping_annotations(all_data):
-    # Group by document_id
-    doc_annotations = defaultdict(list)
+    # Count annotations per document first so single-annotator documents are never grouped
+    counts = Counter(ann['document_id'] for annotations in all_data.values() for ann in annotations)
+    overlap_ids = {doc_id for doc_id, count in counts.items() if count >= 2}
     
+    # Group (annotator, category) pairs for documents with multiple annotations
+    overlapping = defaultdict(list)
     for annotator, annotations in all_data.items():
         for ann in annotations:
             doc_id = ann['document_id']
-            category = ann['category_number']
-            doc_annotations[doc_id].append((annotator, category))
-    
-    # Find documents with multiple annotations
-    overlapping = {}
-    for doc_id, anns in doc_annotations.items():
-        if len(anns) >= 2:
-            overlapping[doc_id] = anns
+            if doc_id in overlap_ids:
+                overlapping[doc_id].append((annotator, ann['category_number']))
     
-    return overlapping
+    return dict(overlapping)
 
 def calculate_krippendorffs_alpha(overlapping_annotations, all_data):
     try:
@@ -73,20 +87,21 @@ def calculate_krippendorffs_alpha(overlapping_annotations, all_data):
         # Build reliability matrix for only overlapping documents
         # Rows = annotators, Columns = overlapping documents
         annotators = list(all_data.keys())
-        overlapping_doc_ids = sorted(overlapping_annotations.keys())
-        doc_id_to_idx = {doc_id: idx for idx, doc_id in enumerate(overlapping_doc_ids)}
+        overlapping_doc_ids = np.fromiter(overlapping_annotations.keys(), dtype=np.int64)
+        overlapping_doc_ids.sort()
 
         # Create matrix (annotators x overlapping documents)
         # Use np.nan for missing values
         matrix = np.full((len(annotators), len(overlapping_doc_ids)), np.nan)
 
         for annotator_idx, annotator in enumerate(annotators):
-            for ann in all_data[annotator]:
-                doc_id = ann['document_id']
-                if doc_id in doc_id_to_idx:
-                    doc_idx = doc_id_to_idx[doc_id]
-                    category = ann['category_number']
-                    matrix[annotator_idx, doc_idx] = category
+            annotations = all_data[annotator]
+            ids = np.fromiter((ann['document_id'] for ann in annotations), dtype=np.int64, count=len(annotations))
+            cats = np.fromiter((ann['category_number'] for ann in annotations), dtype=np.int8, count=len(annotations))
+            # Keep only overlapping documents; their column is their position in the sorted id array
+            mask = np.isin(ids, overlapping_doc_ids)
+            cols = np.searchsorted(overlapping_doc_ids, ids[mask])
+            matrix[annotator_idx, cols] = cats[mask]
 
         print(f"\nCalculating Krippendorff's Alpha for {len(annotators)} annotators:")
         print(f"  - Overlapping documents: {len(overlapping_doc_ids)}")
@@ -110,27 +125,10 @@ def calculate_krippendorffs_alpha(overlapping_annotations, all_data):
 def interpret_agreement(score, metric_name):
     print(f"\nInterpretation of {metric_name} = {score:.4f}:")
     
-    if score < 0:
-        interpretation = "Poor (less than chance agreement)"
-    elif score < 0.20:
-        interpretation = "Slight agreement"
-    elif score < 0.40:
-        interpretation = "Fair agreement"
-    elif score < 0.60:
-        interpretation = "Moderate agreement"
-    elif score < 0.80:
-        interpretation = "Substantial agreement"
-    else:
-        interpretation = "Almost perfect agreement"
+    interpretation = AGREEMENT_LEVELS[bisect.bisect_right(AGREEMENT_THRESHOLDS, score)]
     
     print(f"  {interpretation}")
-    print("\nGeneral guidelines (Landis & Koch, 1977):")
-    print("  < 0.00: Poor")
-    print("  0.00-0.20: Slight")
-    print("  0.21-0.40: Fair")
-    print("  0.41-0.60: Moderate")
-    print("  0.61-0.80: Substantial")
-    print("  0.81-1.00: Almost Perfect")
+    print(AGREEMENT_GUIDELINES)
 
 
 def main():
@@ -183,22 +181,16 @@ def main():
 
         # Diagnostic: Print disagreements for overlapping documents
         print("\n--- Overlapping Document Disagreements ---")
+        # Original labels come from the corpus, so every annotation of a document carries the same one
+        doc_to_original = {ann['document_id']: ann.get('original_label')
+                           for annotations in all_data.values() for ann in annotations}
         disagreement_count = 0
         for doc_id, anns in overlapping.items():
             categories = [cat for _, cat in anns]
             if len(set(categories)) > 1:
                 disagreement_count += 1
                 print(f"Document ID {doc_id}:")
-                # Try to find the original label (first annotation for this doc_id in any annotator)
-                original_label = None
-                for annotator, annotations in all_data.items():
-                    for ann in annotations:
-                        if ann['document_id'] == doc_id:
-                            original_label = ann.get('original_label', None)
-                            break
-                    if original_label is not None:
-                        break
-                print(f"  Original label: {original_label}")
+                print(f"  Original label: {doc_to_original.get(doc_id)}")
                 for annotator, cat in anns:
                     print(f"  {annotator}: {CATEGORIES.get(cat, f'Unknown category {cat}')}")
         print(f"\nTotal overlapping documents: {len(overlapping)}")
@@ -1,104 +1,117 @@
 """
 Export all annotation and re-annotation data to a single Excel file with multiple sheets.
 
-- Sheet 'original_data': document_id, subject, document_text, original_label
-- For each annotator: sheet 'annotations_<name>': document_id, subject, document_text, assigned_label
-- For each re-annotation: sheet 'reannotation_by_<annotator>_for_<source>': document_id, subject, document_text, assigned_label
+- Sheet 'original_data': document_id, subject, document_text, original_label (annotated documents only)
+- Sheet 'assigned_labels': document_id, annotator, source (annotation/reannotation), assigned_label
+
+With --wide, one sheet per annotator and re-annotation is also written:
+- For each annotator: sheet 'annotations_<name>': document_id, subject, assigned_label
+- For each re-annotation: sheet 'reannotation_by_<annotator>_for_<source>': document_id, subject, assigned_label
+
+Document text is only stored once, on the original data sheet; join on document_id to see it.
 """
 
-import json
+import argparse
 from pathlib import Path
 import pandas as pd
 from main import load_data, CATEGORIES
+from annotation_io import annotation_files, read_annotation_files
 
 SCRIPT_DIR = Path(__file__).parent
 
+# Category numbers are dense (1-20), so index a tuple instead of probing the dict per row
+CATEGORY_NAMES = tuple(CATEGORIES.get(i, '') for i in range(max(CATEGORIES) + 1))
+
+
+def load_annotator_files():
+    return [(data['annotator'], data) for data in read_annotation_files(annotation_files())]
+
+
+def load_reannotator_files():
+    files = [f for f in SCRIPT_DIR.glob('*_reannotation.json') if 'backup' not in f.name]
+    return [(data['annotator'], data) for data in read_annotation_files(files)]
+
+
+def category_label(ann):
+    # Numbers outside the table (or without a name) fall back to the stored category name
+    number = ann['category_number']
+    name = CATEGORY_NAMES[number] if 0 <= number < len(CATEGORY_NAMES) else ''
+    return name or ann.get('category_name', '')
 
-def get_all_annotators():
-    files = list(SCRIPT_DIR.glob('annotations_*.json'))
-    annotators = []
-    for f in files:
-        if 'backup' not in f.name and 'reannotation' not in f.name:
-            with open(f, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                annotators.append(data['annotator'])
-    return annotators
 
+ANNOTATION_COLUMNS = ('document_id', 'subject', 'assigned_label')
+LABEL_COLUMNS = ('document_id', 'annotator', 'source', 'assigned_label')
 
-def get_all_reannotators():
-    files = list(SCRIPT_DIR.glob('*_reannotation.json'))
-    reannotators = []
-    for f in files:
-        if 'backup' not in f.name:
-            with open(f, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                reannotators.append((data['annotator'], data.get('reannotating_from', 'unknown')))
-    return reannotators
+
+def annotation_rows(doc_df, annotations):
+    # Look up every annotated document in one call; ids missing from the corpus are dropped
+    positions = doc_df.index.get_indexer([ann['document_id'] for ann in annotations])
+    found = positions >= 0
+    ids = doc_df.index[positions[found]].tolist()
+    subjects = doc_df['subject'].to_numpy()[positions[found]].tolist()
+    labels = [category_label(ann) for ann, keep in zip(annotations, found) if keep]
+    return zip(ids, subjects, labels)
+
+
+def assigned_label_rows(doc_df, annotator_files, reannotator_files):
+    for source, files in (('annotation', annotator_files), ('reannotation', reannotator_files)):
+        for annotator, data in files:
+            for document_id, _, label in annotation_rows(doc_df, data.get('annotations', [])):
+                yield document_id, annotator, source, label
+
+
+def write_sheet(writer, sheet_name, columns, rows):
+    # constant_memory mode flushes each row once written, so rows must be emitted in order
+    # (DataFrame.to_excel writes column by column and would lose data)
+    worksheet = writer.book.add_worksheet(sheet_name)
+    worksheet.write_row(0, 0, columns)
+    for row_idx, row in enumerate(rows, start=1):
+        worksheet.write_row(row_idx, 0, row)
 
 
 def main():
-    documents = load_data()
-    doc_map = {doc['id']: doc for doc in documents}
+    parser = argparse.ArgumentParser(description="Export all annotations to all_annotations.xlsx")
+    parser.add_argument('--wide', action='store_true',
+                        help="also write one sheet per annotator and re-annotation")
+    args = parser.parse_args()
     
-    # Sheet 1: original data
-    original_rows = []
-    for doc in documents:
-        original_rows.append({
-            'document_id': doc['id'],
-            'subject': doc['subject'],
-            'document_text': doc['text'],
-            'original_label': doc['original_label']
-        })
-    df_original = pd.DataFrame(original_rows)
+    annotator_files = load_annotator_files()
+    reannotator_files = load_reannotator_files()
     
-    # Annotation sheets
-    annotators = get_all_annotators()
-    annotation_dfs = {}
-    for annotator in annotators:
-        filename = SCRIPT_DIR / f"annotations_{annotator}.json"
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            rows = []
-            for ann in data['annotations']:
-                doc = doc_map.get(ann['document_id'])
-                if doc:
-                    rows.append({
-                        'document_id': ann['document_id'],
-                        'subject': doc['subject'],
-                        'document_text': doc['text'],
-                        'assigned_label': CATEGORIES.get(ann['category_number'], ann.get('category_name', ''))
-                    })
-            df = pd.DataFrame(rows)
-            annotation_dfs[f'annotations_{annotator}'] = df
+    # Only the documents referenced by some annotation are needed
+    needed_ids = {ann['document_id']
+                  for _, data in annotator_files + reannotator_files
+                  for ann in data.get('annotations', [])}
+    with load_data(needed_ids) as documents:
+        doc_df = pd.DataFrame({
+            'id': documents.ids,
+            'subject': documents.subjects,
+            'text': list(documents.texts),
+            'original_label': documents.original_labels
+        }).set_index('id')
     
-    # Re-annotation sheets
-    reannotators = get_all_reannotators()
-    reannotation_dfs = {}
-    for annotator, source in reannotators:
-        filename = SCRIPT_DIR / f"{annotator}_reannotation.json"
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            rows = []
-            for ann in data.get('annotations', []):
-                doc = doc_map.get(ann['document_id'])
-                if doc:
-                    rows.append({
-                        'document_id': ann['document_id'],
-                        'subject': doc['subject'],
-                        'document_text': doc['text'],
-                        'assigned_label': CATEGORIES.get(ann['category_number'], ann.get('category_name', ''))
-                    })
-            df = pd.DataFrame(rows)
-            sheet_name = f"reannotate_{annotator}_for_{source}"
-            reannotation_dfs[sheet_name] = df
+    # Sheet 1: original data
+    df_original = doc_df[['subject', 'text', 'original_label']].reset_index()
+    df_original = df_original.rename(columns={'id': 'document_id', 'text': 'document_text'})
     
-    # Write to Excel
-    with pd.ExcelWriter(SCRIPT_DIR / 'all_annotations.xlsx', engine='xlsxwriter') as writer:
-        df_original.to_excel(writer, sheet_name='Original Data', index=False)
-        for sheet, df in annotation_dfs.items():
-            df.to_excel(writer, sheet_name=sheet, index=False)
-        for sheet, df in reannotation_dfs.items():
-            df.to_excel(writer, sheet_name=sheet, index=False)
+    options = {'options': {'constant_memory': True}}
+    with pd.ExcelWriter(SCRIPT_DIR / 'all_annotations.xlsx', engine='xlsxwriter', engine_kwargs=options) as writer:
+        write_sheet(writer, 'Original Data', df_original.columns, df_original.itertuples(index=False))
+        
+        write_sheet(writer, 'Assigned Labels', LABEL_COLUMNS,
+                    assigned_label_rows(doc_df, annotator_files, reannotator_files))
+        
+        if args.wide:
+            # Annotation sheets
+            for annotator, data in annotator_files:
+                rows = annotation_rows(doc_df, data['annotations'])
+                write_sheet(writer, f'annotations_{annotator}', ANNOTATION_COLUMNS, rows)
+            
+            # Re-annotation sheets
+            for annotator, data in reannotator_files:
+                source = data.get('reannotating_from', 'unknown')
+                rows = annotation_rows(doc_df, data.get('annotations', []))
+                write_sheet(writer, f"reannotate_{annotator}_for_{source}", ANNOTATION_COLUMNS, rows)
     print("Exported all annotation data to all_annotations.xlsx")
 
 if __name__ == "__main__":
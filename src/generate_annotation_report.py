@@ -6,111 +6,74 @@ Takes into account breaks: if time between annotations > 10 minutes,
 treats it as a separate session (not counted in average time)
 """
 
-import json
-from pathlib import Path
-from datetime import datetime
-from collections import defaultdict
-
-# Get the directory where this script is located
-SCRIPT_DIR = Path(__file__).parent
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from annotation_io import annotation_files, read_annotation_files
 
 # Maximum time between annotations before considering it a break (in minutes)
 BREAK_THRESHOLD_MINUTES = 10
 
 
-def parse_timestamp(timestamp_str):
-    return datetime.fromisoformat(timestamp_str)
-
-
 def load_all_annotations():
-    annotation_files = list(SCRIPT_DIR.glob('annotations_*.json'))
-    annotation_files = [f for f in annotation_files 
-                        if 'backup' not in f.name and 'reannotation' not in f.name]
+    files = annotation_files()
     
-    if len(annotation_files) == 0:
+    if len(files) == 0:
         print("ERROR: No annotation files found")
         return None
     
     all_data = {}
-    for file in annotation_files:
-        with open(file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            annotator = data['annotator']
-            all_data[annotator] = data
+    for data in read_annotation_files(files):
+        annotator = data['annotator']
+        all_data[annotator] = data
     
     return all_data
 
 
-def calculate_annotation_times(annotations):
-    if len(annotations) < 2:
-        return []
+def calculate_annotator_stats(data):
+    annotations = data['annotations']
     
-    # Sort by timestamp
-    sorted_annotations = sorted(annotations, key=lambda x: parse_timestamp(x['timestamp']))
+    # Parse every timestamp once and compute the gaps between consecutive annotations
+    timestamps = np.array([ann['timestamp'] for ann in annotations], dtype='datetime64[ns]')
+    timestamps.sort()
+    gaps = np.diff(timestamps) / np.timedelta64(1, 's')
     
-    annotation_times = []
+    # Only count gaps up to the break threshold (10 minutes); longer gaps are breaks
+    within_session = gaps <= BREAK_THRESHOLD_MINUTES * 60
+    times = gaps[within_session]
     
-    for i in range(1, len(sorted_annotations)):
-        prev_time = parse_timestamp(sorted_annotations[i-1]['timestamp'])
-        curr_time = parse_timestamp(sorted_annotations[i]['timestamp'])
-        
-        time_diff = (curr_time - prev_time).total_seconds()
-        time_diff_minutes = time_diff / 60
-        
-        # Only count if less than break threshold (10 minutes)
-        if time_diff_minutes <= BREAK_THRESHOLD_MINUTES:
-            annotation_times.append(time_diff)
+    # Calculate average and total for this annotator
+    avg_time = float(times.mean()) if times.size else 0.0
+    total_time = float(times.sum())
     
-    return annotation_times
+    return {
+        'num_annotations': len(annotations),
+        'valid_times': len(times),
+        'breaks': int((~within_session).sum()),
+        'avg_time_seconds': avg_time,
+        'avg_time_minutes': avg_time / 60,
+        'total_time_seconds': total_time,
+        'total_time_hours': total_time / 3600,
+        'times': times
+    }
 
 
 def generate_report(all_data):
     print("ANNOTATION REPORT")
     print("COMPSCI 4NL3 - Group 37")
     
-    # Per-annotator statistics
-    annotator_stats = {}
-    all_times = []
-    total_instances = 0
-    total_valid_times = 0
-    total_breaks = 0
-    
-    for annotator, data in all_data.items():
-        annotations = data['annotations']
-        num_annotations = len(annotations)
-        total_instances += num_annotations
-        
-        # Calculate annotation times
-        times = calculate_annotation_times(annotations)
-        all_times.extend(times)
-        
-        # Calculate breaks (gaps > 10 minutes)
-        sorted_annotations = sorted(annotations, key=lambda x: parse_timestamp(x['timestamp']))
-        breaks = 0
-        for i in range(1, len(sorted_annotations)):
-            prev_time = parse_timestamp(sorted_annotations[i-1]['timestamp'])
-            curr_time = parse_timestamp(sorted_annotations[i]['timestamp'])
-            time_diff_minutes = (curr_time - prev_time).total_seconds() / 60
-            if time_diff_minutes > BREAK_THRESHOLD_MINUTES:
-                breaks += 1
-        
-        total_breaks += breaks
-        total_valid_times += len(times)
-        
-        # Calculate average for this annotator
-        avg_time = sum(times) / len(times) if times else 0
-        
-        annotator_stats[annotator] = {
-            'num_annotations': num_annotations,
-            'valid_times': len(times),
-            'breaks': breaks,
-            'avg_time_seconds': avg_time,
-            'avg_time_minutes': avg_time / 60,
-            'total_time_hours': sum(times) / 3600 if times else 0
-        }
+    # Per-annotator statistics (each annotator is independent, so compute them concurrently)
+    with ThreadPoolExecutor() as executor:
+        annotator_stats = dict(zip(all_data, executor.map(calculate_annotator_stats, all_data.values())))
+    
+    total_instances = sum(stats['num_annotations'] for stats in annotator_stats.values())
+    total_valid_times = sum(stats['valid_times'] for stats in annotator_stats.values())
+    total_breaks = sum(stats['breaks'] for stats in annotator_stats.values())
+    all_times = [stats['times'] for stats in annotator_stats.values()]
+    all_times = np.concatenate(all_times) if all_times else np.array([])
     
     # Overall statistics
-    overall_avg_seconds = sum(all_times) / len(all_times) if all_times else 0
+    overall_avg_seconds = float(all_times.mean()) if all_times.size else 0.0
     overall_avg_minutes = overall_avg_seconds / 60
     
     print("\nPER-ANNOTATOR STATISTICS:")
@@ -135,33 +98,25 @@ def generate_report(all_data):
     # Category distribution
     print("\nCATEGORY DISTRIBUTION:")
     
-    category_counts = defaultdict(int)
-    for annotator, data in all_data.items():
-        for ann in data['annotations']:
-            category_counts[ann['category_name']] += 1
+    category_counts = Counter(ann['category_name'] for data in all_data.values() for ann in data['annotations'])
     
-    for category, count in sorted(category_counts.items(), key=lambda x: x[1], reverse=True):
+    for category, count in category_counts.most_common():
         percentage = (count / total_instances) * 100
         print(f"  {category:30s}  {count:4d}  ({percentage:5.1f}%)")
     
     # Time analysis
-    if all_times:
+    if all_times.size:
         print("\nTIME DISTRIBUTION ANALYSIS:")
 
-        times_minutes = [t / 60 for t in all_times]
-        times_minutes.sort()
-        
-        # Calculate percentiles
-        def percentile(data, p):
-            index = int(len(data) * p / 100)
-            return data[min(index, len(data) - 1)]
+        times_minutes = all_times / 60
+        p25, p50, p75, p90 = np.percentile(times_minutes, [25, 50, 75, 90])
         
-        print(f"  Minimum time:      {min(times_minutes):.2f} minutes")
-        print(f"  25th percentile:   {percentile(times_minutes, 25):.2f} minutes")
-        print(f"  Median (50th):     {percentile(times_minutes, 50):.2f} minutes")
-        print(f"  75th percentile:   {percentile(times_minutes, 75):.2f} minutes")
-        print(f"  90th percentile:   {percentile(times_minutes, 90):.2f} minutes")
-        print(f"  Maximum time:      {max(times_minutes):.2f} minutes")
+        print(f"  Minimum time:      {times_minutes.min():.2f} minutes")
+        print(f"  25th percentile:   {p25:.2f} minutes")
+        print(f"  Median (50th):     {p50:.2f} minutes")
+        print(f"  75th percentile:   {p75:.2f} minutes")
+        print(f"  90th percentile:   {p90:.2f} minutes")
+        print(f"  Maximum time:      {times_minutes.max():.2f} minutes")
 
 def main():
     print("Loading annotation data...")
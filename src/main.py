@@ -3,16 +3,51 @@
 COMPSCI 4NL3 - Group 37
 """
 
-import json
+import gc
 import os
+import pickle
+import re
+import shutil
 import sys
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+import numpy as np
 from sklearn.datasets import fetch_20newsgroups
+from annotation_io import (
+    annotation_files,
+    append_json_line,
+    iter_document_ids,
+    journal_path,
+    read_journal,
+    read_json,
+    read_json_at,
+    write_json
+)
+from newsgroup_text import strip_newsgroup_footer, strip_newsgroup_header, strip_newsgroup_quoting
 
 # Get the directory where this script is located
 SCRIPT_DIR = Path(__file__).parent
 
+# Subject header line, searched only within a document's headers
+SUBJECT_RE = re.compile(r'^Subject: (.*)$', re.MULTILINE)
+SUBJECT_SEARCH_LIMIT = 4096
+
+# Number of characters of document text shown per document
+PREVIEW_CHARS = 2000
+
+# Number of annotations between full rewrites of the annotation file, and between backup copies
+SAVE_EVERY = 25
+BACKUP_EVERY = 50
+
+# Prebuilt document store, written on the first run (or by prepare_documents.py): the small
+# columns and text offsets are pickled, the texts themselves are one JSON line per document
+DOCUMENTS_FILE = SCRIPT_DIR / "documents.pkl"
+DOCUMENT_TEXTS_FILE = SCRIPT_DIR / "documents.jsonl"
+
+# Bump whenever build_documents changes its output, so existing stores are rebuilt
+DOCUMENTS_VERSION = 1
+
 
 # Category mappings
 CATEGORIES = {
@@ -39,40 +74,53 @@ CATEGORIES = {
 }
 
 
+# Static screen text, built once
+CLEAR_SCREEN = "\x1b[2J\x1b[H"  # ANSI clear + cursor home; no subprocess per redraw
+CATEGORY_MENU = "\nCATEGORIES:\n" + "".join(f"  {num}. {name}\n" for num, name in CATEGORIES.items())
+COMMAND_MENU = (
+    "\nCOMMANDS:\n"
+    "  Enter 1-20: Assign category\n"
+    "  's': Skip this document\n"
+    "  'q': Save and quit\n"
+    "  'h': Show categories again\n"
+)
+
+
 def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    sys.stdout.write(CLEAR_SCREEN)
+    sys.stdout.flush()
 
 
 def display_categories():
-    print("\nCATEGORIES:")
-    for num, name in CATEGORIES.items():
-        print(f"  {num}. {name}")
+    sys.stdout.write(CATEGORY_MENU)
+    sys.stdout.flush()
 
 
-def display_document(doc_id, text, subject, total_docs, annotated_count):
-    clear_screen()
-    print(f"20 NEWSGROUPS ANNOTATION TOOL - Document {doc_id} of {total_docs}")
-    print(f"Progress: {annotated_count}/{total_docs} annotated ({annotated_count/total_docs*100:.1f}%)")
-    
-    # Display subject
-    print(f"\nSUBJECT: {subject}")
-    
-    # Display document text
-    print("\nDOCUMENT TEXT:")
-    print(text[:2000])  # Limit display to first 2000 characters
-    if len(text) > 2000:
-        print("\n... (text truncated for display) ...")
+def display_document(doc_id, preview, subject, total_docs, annotated_count):
+    # Build the whole screen, including the menus, and emit it with a single write
+    parts = [
+        CLEAR_SCREEN,
+        f"20 NEWSGROUPS ANNOTATION TOOL - Document {doc_id} of {total_docs}\n",
+        f"Progress: {annotated_count}/{total_docs} annotated ({annotated_count/total_docs*100:.1f}%)\n",
+        f"\nSUBJECT: {subject}\n",
+        "\nDOCUMENT TEXT:\n",
+        preview, "\n",
+        CATEGORY_MENU,
+        COMMAND_MENU
+    ]
+    sys.stdout.write("".join(parts))
+    sys.stdout.flush()
+
+
+def make_preview(text):
+    # Limit display to the first PREVIEW_CHARS characters
+    if len(text) <= PREVIEW_CHARS:
+        return text
+    return text[:PREVIEW_CHARS] + "\n\n... (text truncated for display) ..."
 
 
 def get_annotation():
-    display_categories()
-    
-    print("\nCOMMANDS:")
-    print("  Enter 1-20: Assign category")
-    print("  's': Skip this document")
-    print("  'q': Save and quit")
-    print("  'h': Show categories again")
-    
+    # The categories and commands are shown by display_document
     while True:
         response = input("\nYour choice: ").strip().lower()
         
@@ -94,41 +142,165 @@ def get_annotation():
             print("ERROR: Invalid input. Please enter a number (1-20), 's' to skip, or 'q' to quit.")
 
 
-def load_data():
-    try:
-        
-        print("Loading 20 Newsgroups dataset...")
+class DocumentTexts:
+    """Document texts read on demand from DOCUMENT_TEXTS_FILE; only their byte offsets stay in memory.
+
+    Views made with take() share this object's file handle, so closing any of them closes all.
+    """
+    
+    def __init__(self, path, starts, ends, file=None):
+        self.path = path
+        self.starts = starts
+        self.ends = ends
+        self._file = file if file is not None else open(path, 'rb')
+    
+    def __len__(self):
+        return len(self.starts)
+    
+    def __getitem__(self, position):
+        return read_json_at(self._file, int(self.starts[position]), int(self.ends[position]))['text']
+    
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def take(self, positions):
+        return DocumentTexts(self.path, self.starts[positions], self.ends[positions], self._file)
+    
+    def close(self):
+        self._file.close()
+
+
+@dataclass
+class Documents:
+    """20 Newsgroups documents stored column-wise; row i of every column is the same document."""
+    ids: np.ndarray
+    texts: DocumentTexts
+    subjects: list
+    original_labels: list
+    sources: list
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def preview(self, position):
+        # Only the displayed document's text is read and truncated
+        return make_preview(self.texts[position])
+    
+    def close(self):
+        self.texts.close()
+    
+    def take(self, positions):
+        return Documents(
+            ids=self.ids[positions],
+            texts=self.texts.take(positions),
+            subjects=[self.subjects[i] for i in positions],
+            original_labels=[self.original_labels[i] for i in positions],
+            sources=[self.sources[i] for i in positions]
+        )
+
+
+def build_documents():
+    """Build the document columns (plain lists/arrays, so the stored pickle does not depend on this module)."""
+    # Fetch each subset once with headers kept; the clean text is derived in Python with the
+    # same header/footer/quote stripping (and order) that fetch_20newsgroups(remove=...) applies.
+    # Subsets are processed one at a time so only one raw (with headers) copy is resident at once.
+    texts = []
+    subjects = []
+    original_labels = []
+    sources = []
+    for subset in ('train', 'test'):
+        data = fetch_20newsgroups(subset=subset)
+        for text_with_headers in data.data:
+            # Extract subject from the header block (everything before the first blank line)
+            header_end = text_with_headers.find('\n\n')
+            match = SUBJECT_RE.search(text_with_headers, 0, header_end if header_end != -1 else SUBJECT_SEARCH_LIMIT)
+            subjects.append(match.group(1).strip() if match else "(No Subject)")
+            
+            text = strip_newsgroup_header(text_with_headers)
+            texts.append(strip_newsgroup_quoting(strip_newsgroup_footer(text)))
         
-        # Load with headers to extract subjects
-        train_data_with_headers = fetch_20newsgroups(subset='train', remove=('footers', 'quotes'))
-        test_data_with_headers = fetch_20newsgroups(subset='test', remove=('footers', 'quotes'))
+        original_labels.extend(data.target_names[label] for label in data.target)
+        sources.extend([subset] * len(data.data))
         
-        # Load without headers for clean text
-        train_data = fetch_20newsgroups(subset='train', remove=('headers', 'footers', 'quotes'))
-        test_data = fetch_20newsgroups(subset='test', remove=('headers', 'footers', 'quotes'))
+        # Release the raw subset before fetching the next one
+        del data
+        gc.collect()
+    
+    return {
+        'ids': np.arange(len(texts), dtype=np.int32),
+        'texts': texts,
+        'subjects': subjects,
+        'original_labels': original_labels,
+        'sources': sources
+    }
+
+
+def save_documents(columns):
+    """Write the document store: texts to DOCUMENT_TEXTS_FILE, everything else to DOCUMENTS_FILE."""
+    # The pickle is removed first and written last, so its presence means the store is complete;
+    # both files are written to a temporary name and moved into place
+    DOCUMENTS_FILE.unlink(missing_ok=True)
+    
+    offsets = np.empty(len(columns['ids']) + 1, dtype=np.int64)
+    texts_tmp = DOCUMENT_TEXTS_FILE.with_name(DOCUMENT_TEXTS_FILE.name + '.tmp')
+    with open(texts_tmp, 'wb') as f:
+        offsets[0] = 0
+        for i, (doc_id, subject, text) in enumerate(zip(columns['ids'], columns['subjects'], columns['texts'])):
+            append_json_line(f, {'id': int(doc_id), 'subject': subject, 'text': text})
+            offsets[i + 1] = f.tell()
+    os.replace(texts_tmp, DOCUMENT_TEXTS_FILE)
+    
+    index = {key: value for key, value in columns.items() if key != 'texts'}
+    index['offsets'] = offsets
+    index['version'] = DOCUMENTS_VERSION
+    index_tmp = DOCUMENTS_FILE.with_name(DOCUMENTS_FILE.name + '.tmp')
+    with open(index_tmp, 'wb') as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(index_tmp, DOCUMENTS_FILE)
+
+
+def open_documents():
+    """Open the document store, or return None if it is missing or was built by an older version.
+
+    Texts are read from disk only when accessed.
+    """
+    if not DOCUMENTS_FILE.exists() or not DOCUMENT_TEXTS_FILE.exists():
+        return None
+    with open(DOCUMENTS_FILE, 'rb') as f:
+        index = pickle.load(f)
+    if index.pop('version', None) != DOCUMENTS_VERSION:
+        return None
+    offsets = index.pop('offsets')
+    return Documents(texts=DocumentTexts(DOCUMENT_TEXTS_FILE, offsets[:-1], offsets[1:]), **index)
+
+
+def load_data(ids=None):
+    """Load the 20 Newsgroups documents; if ids is given, only those documents are kept."""
+    try:
         
-        # Combine data
-        all_texts = list(train_data.data) + list(test_data.data)
-        all_texts_with_headers = list(train_data_with_headers.data) + list(test_data_with_headers.data)
-        all_labels = list(train_data.target) + list(test_data.target)
+        print("Loading 20 Newsgroups dataset...")
         
-        # Create document entries
-        documents = []
-        for i, (text, text_with_headers, label) in enumerate(zip(all_texts, all_texts_with_headers, all_labels)):
-            # Extract subject from headers
-            subject = "(No Subject)"
-            for line in text_with_headers.split('\n')[:20]:  # Check first 20 lines
-                if line.startswith('Subject: '):
-                    subject = line[9:].strip()
-                    break
-            
-            documents.append({
-                'id': i,
-                'text': text,
-                'subject': subject,
-                'original_label': train_data.target_names[label],
-                'source': 'train' if i < len(train_data.data) else 'test'
-            })
+        # The first run (or the first after DOCUMENTS_VERSION changes) builds the documents and
+        # writes the store; later runs only load the small columns and read each text when needed
+        documents = open_documents()
+        if documents is None:
+            save_documents(build_documents())
+            documents = open_documents()
+        if ids is not None:
+            wanted = np.fromiter(ids, dtype=np.int64, count=len(ids))
+            documents = documents.take(np.flatnonzero(np.isin(documents.ids, wanted)))
         
         print(f"Loaded {len(documents)} documents")
         return documents
@@ -140,13 +312,26 @@ def load_data():
         sys.exit(1)
 
 
-def load_annotations(annotator_name):
-    filename = SCRIPT_DIR / f"annotations_{annotator_name}.json"
+def load_annotations(annotator_name, mode='new', reannotation_assignment=None):
+    """Load the annotator's existing annotations for this mode, or start a new record."""
+    filename = SCRIPT_DIR / f"{annotation_file_base(annotator_name, mode)}.json"
     if filename.exists():
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = read_json(filename)
+        if mode == 'reannotate':
+            print(f"Loaded existing re-annotations: {len(data['annotations'])}")
+        else:
             print(f"Loaded {len(data.get('annotations', []))} existing annotations")
-            return data
+        return data
+    
+    # For re-annotation, use a separate file
+    if mode == 'reannotate':
+        return {
+            'annotator': annotator_name,
+            'mode': 'reannotation',
+            'reannotating_from': reannotation_assignment['reannotating_from'],
+            'created_at': datetime.now().isoformat(),
+            'annotations': []
+        }
     return {
         'annotator': annotator_name,
         'created_at': datetime.now().isoformat(),
@@ -158,17 +343,11 @@ def load_all_annotated_ids():
     """Load document IDs that have been annotated by ANY annotator."""
     all_annotated_ids = set()
     
-    # Find all annotation files
-    for annotation_file in SCRIPT_DIR.glob("annotations_*.json"):
-        # Skip backup and reannotation files
-        if 'backup' in annotation_file.name or 'reannotation' in annotation_file.name:
-            continue
-        
+    # Find all annotation files (backup and reannotation files are skipped)
+    for annotation_file in annotation_files():
         try:
-            with open(annotation_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                for ann in data.get('annotations', []):
-                    all_annotated_ids.add(ann['document_id'])
+            # Only the document ids are needed, so stream them instead of loading whole files
+            all_annotated_ids.update(iter_document_ids(annotation_file))
         except Exception as e:
             print(f"Error loading annotations from {annotation_file}: {e}")
             continue
@@ -176,60 +355,71 @@ def load_all_annotated_ids():
     return all_annotated_ids
 
 
-def save_annotations(annotation_data, annotator_name, mode='new'):
+def annotation_file_base(annotator_name, mode='new'):
     suffix = '_reannotation' if mode == 'reannotate' else ''
     prefix = '' if mode == 'reannotate' else "annotations_"
-    filename = SCRIPT_DIR / f"{prefix}{annotator_name}{suffix}.json"
-    annotation_data['last_updated'] = datetime.now().isoformat()
+    return f"{prefix}{annotator_name}{suffix}"
+
+
+def save_annotations(annotation_data, annotator_name, mode='new', backup=False, updated_at=None):
+    filename_base = annotation_file_base(annotator_name, mode)
+    filename = SCRIPT_DIR / f"{filename_base}.json"
+    annotation_data['last_updated'] = updated_at or datetime.now().isoformat()
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(annotation_data, f, indent=2, ensure_ascii=False)
+    write_json(filename, annotation_data)
     
-    # Also save a backup
-    backup_filename = SCRIPT_DIR / f"{prefix}{annotator_name}{suffix}_backup.json"
-    with open(backup_filename, 'w', encoding='utf-8') as f:
-        json.dump(annotation_data, f, indent=2, ensure_ascii=False)
+    # The backup is a plain copy of the file just written, not a second serialization
+    if backup:
+        shutil.copyfile(filename, SCRIPT_DIR / f"{filename_base}_backup.json")
+
+
+def recover_from_journal(annotation_data, annotation_file):
+    # The journal gets every annotation immediately, so after a crash it can be ahead of the last full save
+    journaled = read_journal(annotation_file)
+    if journaled is not None:
+        missing = len(journaled) - len(annotation_data['annotations'])
+        if missing > 0:
+            annotation_data['annotations'] = journaled
+            print(f"Recovered {missing} unsaved annotations from {journal_path(annotation_file).name}")
+
+
+def open_journal(journal_file, annotations):
+    # Start the journal in sync with the loaded annotations; new ones are appended as they are made
+    journal = open(journal_file, 'wb')
+    for ann in annotations:
+        append_json_line(journal, ann)
+    journal.flush()
+    return journal
 
 
 def load_reannotation_assignment(annotator_name):
     filename = SCRIPT_DIR / f"reannotate_{annotator_name}.json"
     if filename.exists():
-        with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return read_json(filename)
     return None
 
 
-def get_next_document(documents, annotation_data, mode='new', reannotation_assignment=None, skipped_ids=None, all_annotated_ids=None):
-    if skipped_ids is None:
-        skipped_ids = set()
-    
-    annotated_ids = {ann['document_id'] for ann in annotation_data['annotations']}
-    excluded_ids = annotated_ids | skipped_ids
-    
-    if mode == 'new':
-        # For new annotations, also exclude documents annotated by ANYONE
-        if all_annotated_ids is not None:
-            excluded_ids = excluded_ids | all_annotated_ids
-        
-        # Find first unannotated and non-skipped document
-        for doc in documents:
-            if doc['id'] not in excluded_ids:
-                return doc
-    elif mode == 'reannotate':
-        # For re-annotation mode, get documents from assignment
-        if reannotation_assignment is None:
-            return None
-        
-        target_ids = set(reannotation_assignment['document_ids'])
-        
-        # Find next document in assignment that hasn't been re-annotated or skipped yet
-        for doc in documents:
-            if doc['id'] in target_ids and doc['id'] not in excluded_ids:
-                return doc
+def get_next_document(document_order, cursor, excluded_ids):
+    """Return (position, cursor) for the next document in document_order that still needs annotating.
+
+    document_order holds document positions (== ids). excluded_ids is the caller's set of annotated
+    and skipped ids, updated as the session goes, so this never rebuilds it. Documents only ever
+    become excluded, so the scan resumes from the cursor; pass the returned cursor back in.
+    position is None when done.
+    """
+    # Find next unannotated and non-skipped document
+    while cursor < len(document_order) and document_order[cursor] in excluded_ids:
+        cursor += 1
     
-    return None
+    if cursor == len(document_order):
+        return None, cursor
+    return document_order[cursor], cursor
 
 def main():
+    if os.name == 'nt':
+        # Enables ANSI escape sequences (used by clear_screen) in the Windows console
+        os.system('')
+    
     clear_screen()
     print("20 NEWSGROUPS ANNOTATION TOOL")
     print("COMPSCI 4NL3 - Group 37")
@@ -263,7 +453,7 @@ def main():
     
     # Load data
     documents = load_data()
-    annotation_data = load_annotations(annotator_name)
+    annotation_data = load_annotations(annotator_name, mode, reannotation_assignment)
     
     # For new annotations, load all annotated IDs to avoid duplicates
     all_annotated_ids = None
@@ -273,34 +463,44 @@ def main():
             print(f"Found {len(all_annotated_ids)} documents already annotated by all annotators")
             print("Will skip these to avoid duplicates")
     
-    # For re-annotation, use a separate file
-    if mode == 'reannotate':
-        reannotation_file = SCRIPT_DIR / f"{annotator_name}_reannotation.json"
-        if reannotation_file.exists():
-            with open(reannotation_file, 'r', encoding='utf-8') as f:
-                annotation_data = json.load(f)
-                print(f"Loaded existing re-annotations: {len(annotation_data['annotations'])}")
-        else:
-            annotation_data = {
-                'annotator': annotator_name,
-                'mode': 'reannotation',
-                'reannotating_from': reannotation_assignment['reannotating_from'],
-                'created_at': datetime.now().isoformat(),
-                'annotations': []
-            }
+    filename_base = annotation_file_base(annotator_name, mode)
+    annotation_file = SCRIPT_DIR / f"{filename_base}.json"
+    journal_file = journal_path(annotation_file)
+    recover_from_journal(annotation_data, annotation_file)
+    
+    # The other scripts find annotators by their .json file and read the journal alongside it,
+    # so make sure it exists before annotations start going only to the journal
+    if not annotation_file.exists():
+        save_annotations(annotation_data, annotator_name, mode)
     
     annotated_count = len(annotation_data['annotations'])
-    skipped_ids = set()  # Track skipped documents in this session
+    unsaved = 0  # Annotations only in the journal since the last full save
+    since_backup = 0  # Annotations since the backup was last refreshed
+    
+    # Document ids in the order they are offered (documents are stored by id); re-annotation
+    # only visits the assigned documents. Documents already excluded are dropped up front in one
+    # vectorized pass; excluded_ids then grows with this session's annotations and skips.
+    if mode == 'reannotate':
+        document_order = np.unique(np.asarray(reannotation_assignment['document_ids'], dtype=np.int64))
+    else:
+        document_order = documents.ids
+    # For new annotations, also exclude documents annotated by ANYONE
+    excluded_ids = {ann['document_id'] for ann in annotation_data['annotations']} | (all_annotated_ids or set())
+    excluded = np.fromiter(excluded_ids, dtype=np.int64, count=len(excluded_ids))
+    document_order = document_order[~np.isin(document_order, excluded)].tolist()
+    cursor = 0
+    
     print(f"\nReady to annotate! Currently have {annotated_count} annotations.")
     input("\nPress Enter to start annotating...")
     
     # Annotation loop
+    journal = open_journal(journal_file, annotation_data['annotations'])
     try:
         while True:
             # Get next document
-            doc = get_next_document(documents, annotation_data, mode, reannotation_assignment, skipped_ids, all_annotated_ids)
+            position, cursor = get_next_document(document_order, cursor, excluded_ids)
             
-            if doc is None:
+            if position is None:
                 if mode == 'reannotate':
                     print("\nAll re-annotation documents have been completed!")
                 else:
@@ -310,44 +510,57 @@ def main():
             # Display document
             total_docs = reannotation_assignment['num_documents'] if mode == 'reannotate' else len(documents)
             
-            display_document(doc['id'], doc['text'], doc['subject'], total_docs, annotated_count)
+            doc_id = int(documents.ids[position])
+            display_document(doc_id, documents.preview(position), documents.subjects[position], total_docs, annotated_count)
             
             result = get_annotation()
             
             if result == 'quit':
                 break
             elif result == 'skip':
-                skipped_ids.add(doc['id'])
+                excluded_ids.add(doc_id)
                 print("\nDocument skipped.")
                 continue
             else:
-                # Save annotation
+                # Save annotation (one timestamp serves the annotation and the file's last_updated)
+                now_iso = datetime.now().isoformat()
                 annotation = {
-                    'document_id': doc['id'],
+                    'document_id': doc_id,
                     'category_number': result,
                     'category_name': CATEGORIES[result],
-                    'original_label': doc['original_label'],
-                    'timestamp': datetime.now().isoformat()
+                    'original_label': documents.original_labels[position],
+                    'timestamp': now_iso
                 }
                 annotation_data['annotations'].append(annotation)
+                excluded_ids.add(doc_id)
                 annotated_count += 1
                 
-                # Save immediately
-                save_annotations(annotation_data, annotator_name, mode)
-                
-                print(f"\nSaved! ({annotated_count} documents annotated)")
+                # Journal immediately; rewrite the full file only every SAVE_EVERY annotations
+                append_json_line(journal, annotation)
+                journal.flush()
+                unsaved += 1
+                since_backup += 1
+                if unsaved >= SAVE_EVERY:
+                    backup = since_backup >= BACKUP_EVERY
+                    save_annotations(annotation_data, annotator_name, mode, backup=backup, updated_at=now_iso)
+                    unsaved = 0
+                    if backup:
+                        since_backup = 0
+                    print(f"\nSaved! ({annotated_count} documents annotated)")
+                else:
+                    print(f"\nRecorded! ({annotated_count} documents annotated)")
                 input("Press Enter to continue...")
     
     except KeyboardInterrupt:
         print("\n\nWARNING: Interrupted by user")
     
     finally:
-        # Final save
-        save_annotations(annotation_data, annotator_name, mode)
-        
-        suffix = '_reannotation' if mode == 'reannotate' else ''
-        prefix = '' if mode == 'reannotate' else "annotations_"
-        filename_base = f"{prefix}{annotator_name}{suffix}"
+        # Final save (with backup); the journal is redundant once everything is in the main file,
+        # so it is only removed after the save succeeds (and may already be gone)
+        journal.close()
+        documents.close()
+        save_annotations(annotation_data, annotator_name, mode, backup=True)
+        journal_file.unlink(missing_ok=True)
         
         print(f"Total annotations: {len(annotation_data['annotations'])}")
         print(f"Data saved to: {filename_base}.json")
@@ -0,0 +1,38 @@
+"""
+Header, footer and quote stripping for 20 Newsgroups messages
+
+Copied from scikit-learn's sklearn/datasets/_twenty_newsgroups.py (BSD-3-Clause license),
+which is a private module and may change between releases. These are the same steps
+fetch_20newsgroups(remove=('headers', 'footers', 'quotes')) applies, so the text matches it.
+"""
+
+import re
+
+# Lines that are quoted or that introduce a quoted section
+_QUOTE_RE = re.compile(r"(writes in|writes:|wrote:|says:|said:|^In article|^Quoted from|^\||^>)")
+
+
+def strip_newsgroup_header(text):
+    """Remove the headers: everything before the first blank line."""
+    _before, _blankline, after = text.partition("\n\n")
+    return after
+
+
+def strip_newsgroup_quoting(text):
+    """Remove lines starting with > or |, and lines that introduce a quote (e.g. containing 'writes:')."""
+    good_lines = [line for line in text.split("\n") if not _QUOTE_RE.search(line)]
+    return "\n".join(good_lines)
+
+
+def strip_newsgroup_footer(text):
+    """Remove a signature block: everything after the last blank or all-hyphen line."""
+    lines = text.strip().split("\n")
+    for line_num in range(len(lines) - 1, -1, -1):
+        line = lines[line_num]
+        if line.strip().strip("-") == "":
+            break
+
+    if line_num > 0:
+        return "\n".join(lines[:line_num])
+    else:
+        return text
@@ -0,0 +1,23 @@
+"""
+Prepare the processed 20 Newsgroups documents once
+
+Builds the document columns used by main.py (ids, texts, subjects, original_labels, sources)
+and saves them as documents.pkl (everything but the texts) and documents.jsonl (one text per
+line), so later runs load them directly instead of re-fetching and re-parsing the dataset.
+main.py also writes these files itself on its first run.
+"""
+
+from main import DOCUMENTS_FILE, DOCUMENT_TEXTS_FILE, build_documents, save_documents
+
+
+def main():
+    print("Building documents from the 20 Newsgroups dataset...")
+    columns = build_documents()
+    
+    save_documents(columns)
+    
+    print(f"Saved {len(columns['ids'])} documents to {DOCUMENTS_FILE} and {DOCUMENT_TEXTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,38 +5,35 @@ This script helps you select documents that have been annotated by one person
 to be re-annotated by another person for calculating inter-annotator agreement.
 """
 
-import json
-import random
 from pathlib import Path
 from collections import defaultdict
+import numpy as np
+from annotation_io import annotation_files, read_annotation_files, write_json
 
 # Get the directory where this script  is located
 SCRIPT_DIR = Path(__file__).parent
 
 
 def load_all_annotations():
-    annotation_files = list(SCRIPT_DIR.glob('annotations_*.json'))
-    annotation_files = [f for f in annotation_files if 'backup' not in f.name]
+    files = annotation_files()
     
-    if len(annotation_files) == 0:
+    if len(files) == 0:
         print("ERROR: No annotation files found")
         return None
     
-    print(f"Found {len(annotation_files)} annotation file(s):")
+    print(f"Found {len(files)} annotation file(s):")
     all_data = {}
-    for file in annotation_files:
-        with open(file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            annotator = data['annotator']
-            all_data[annotator] = data
-            num_annotations = len(data['annotations'])
-            print(f"  - {file.name}: {num_annotations} annotations by {annotator}")
+    for file, data in zip(files, read_annotation_files(files)):
+        annotator = data['annotator']
+        all_data[annotator] = data
+        num_annotations = len(data['annotations'])
+        print(f"  - {file.name}: {num_annotations} annotations by {annotator}")
     
     return all_data
 
 
 def select_overlap_documents(all_data, percentage=15, seed=42):
-    random.seed(seed)
+    rng = np.random.default_rng(seed)
     
     # Get all annotated document IDs per annotator
     annotator_docs = {}
@@ -69,7 +66,9 @@ def select_overlap_documents(all_data, percentage=15, seed=42):
         # Select random documents from next_annotator
         available_docs = annotator_docs[next_annotator]
         if len(available_docs) >= docs_per_annotator:
-            selected = random.sample(available_docs, docs_per_annotator)
+            # Draw positions with numpy's generator; ids stay plain ints for the JSON output
+            positions = rng.choice(len(available_docs), size=docs_per_annotator, replace=False)
+            selected = [available_docs[pos] for pos in positions]
         else:
             selected = available_docs
             print(f"WARNING: Not enough documents from {next_annotator} for {current_annotator}")
@@ -85,8 +84,7 @@ def select_overlap_documents(all_data, percentage=15, seed=42):
 def save_reannotation_assignments(assignments):
     filename = SCRIPT_DIR / "reannotation_assignments.json"
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(assignments, f, indent=2)
+    write_json(filename, assignments)
     
     print(f"\nAssignments saved to {filename}")
 
@@ -107,8 +105,7 @@ def create_reannotation_files(assignments):
             'num_documents': len(doc_ids)
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        write_json(filename, data)
         
         print(f"Created {filename} for {annotator} ({len(doc_ids)} docs)")
 
@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import annotation_io
+from annotation_io import annotation_files, iter_document_ids, journal_path, read_annotation_file
+
+
+def test_journal_with_truncated_last_line(tmp_path, capsys):
+    journal = tmp_path / "annotations_alice.jsonl"
+    journal.write_bytes(
+        b'{"document_id": 1, "category_number": 3}\n'
+        b'{"document_id": 2, "category_number": 5}\n'
+        b'{"document_id": 3, "categ'
+    )
+    
+    data = read_annotation_file(journal)
+    
+    assert data['annotator'] == 'alice'
+    assert [ann['document_id'] for ann in data['annotations']] == [1, 2]
+    assert "incomplete last line" in capsys.readouterr().out
+
+
+def test_journal_is_merged_and_not_discovered(tmp_path, monkeypatch):
+    monkeypatch.setattr(annotation_io, 'SCRIPT_DIR', tmp_path)
+    saved = tmp_path / "annotations_bob.json"
+    saved.write_bytes(b'{"annotator": "bob", "annotations": [{"document_id": 1}]}')
+    journal_path(saved).write_bytes(b'{"document_id": 1}\n{"document_id": 2}\n')
+    
+    assert annotation_files() == [saved]
+    assert [ann['document_id'] for ann in read_annotation_file(saved)['annotations']] == [1, 2]
+    assert set(iter_document_ids(saved)) == {1, 2}
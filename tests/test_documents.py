@@ -0,0 +1,91 @@
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+pytest.importorskip("sklearn")
+import main
+
+
+def make_columns():
+    return {
+        'ids': np.arange(3, dtype=np.int32),
+        'texts': ["first text", "second é text\nwith two lines", "x" * (main.PREVIEW_CHARS + 10)],
+        'subjects': ["one", "two", "three"],
+        'original_labels': ["sci.med", "rec.autos", "sci.space"],
+        'sources': ["train", "train", "test"]
+    }
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'DOCUMENTS_FILE', tmp_path / "documents.pkl")
+    monkeypatch.setattr(main, 'DOCUMENT_TEXTS_FILE', tmp_path / "documents.jsonl")
+    builds = []
+    
+    def build_documents():
+        builds.append(1)
+        return make_columns()
+    
+    monkeypatch.setattr(main, 'build_documents', build_documents)
+    return builds
+
+
+def test_round_trip(store):
+    columns = make_columns()
+    main.save_documents(columns)
+    
+    with main.open_documents() as documents:
+        assert documents.ids.tolist() == [0, 1, 2]
+        assert list(documents.texts) == columns['texts']
+        assert documents.subjects == columns['subjects']
+        assert documents.original_labels == columns['original_labels']
+        assert documents.sources == columns['sources']
+        assert documents.preview(2).endswith("(text truncated for display) ...")
+        
+        # Views read the right lines, in any order, through the shared handle
+        view = documents.take([2, 0])
+        assert view.ids.tolist() == [2, 0]
+        assert view.texts[1] == "first text"
+        assert view.texts[0] == columns['texts'][2]
+        assert view.subjects == ["three", "one"]
+
+
+def test_load_data_builds_once(store):
+    main.load_data().close()
+    main.load_data().close()
+    assert len(store) == 1
+
+
+def test_version_mismatch_rebuilds(store):
+    main.save_documents(make_columns())
+    with open(main.DOCUMENTS_FILE, 'rb') as f:
+        index = pickle.load(f)
+    index['version'] = main.DOCUMENTS_VERSION - 1
+    with open(main.DOCUMENTS_FILE, 'wb') as f:
+        pickle.dump(index, f)
+    
+    assert main.open_documents() is None
+    with main.load_data() as documents:
+        assert list(documents.texts) == make_columns()['texts']
+    assert len(store) == 1
+
+
+def test_interrupted_rewrite_leaves_no_stale_index(store):
+    main.save_documents(make_columns())
+    
+    def interrupted_texts():
+        yield "partial"
+        raise KeyboardInterrupt
+    
+    with pytest.raises(KeyboardInterrupt):
+        main.save_documents(dict(make_columns(), texts=interrupted_texts()))
+    
+    assert not main.DOCUMENTS_FILE.exists()
+    assert main.open_documents() is None
+    with main.load_data() as documents:
+        assert list(documents.texts) == make_columns()['texts']